@@ -6,16 +6,28 @@ Built for Resilient Equity Green Tech Foundation
 """
 
 import os
-import json
+import hashlib
+import hmac
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-from flask import Flask, request, jsonify
+from typing import Dict, FrozenSet, List, Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 import requests
-import openai
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
+import orjson
 import re
+from cachetools import TTLCache
 from dotenv import load_dotenv
+from openai import OpenAI
 
 # Load environment variables
 load_dotenv()
@@ -30,14 +42,126 @@ class Config:
     WHATSAPP_PHONE_NUMBER_ID = os.getenv('WHATSAPP_PHONE_NUMBER_ID', '740549401652542')
     VERIFY_TOKEN = os.getenv('VERIFY_TOKEN', 'resilient_equity_verify_token')
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
+    APP_SECRET = os.getenv('META_APP_SECRET', '')
     PORT = int(os.getenv('PORT', 5000))
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+    WORKER_THREADS = int(os.getenv('WORKER_THREADS', 16))
+    AI_CACHE_TTL = int(os.getenv('AI_CACHE_TTL', 3600))
+    WHATSAPP_WARMUP = os.getenv('WHATSAPP_WARMUP', 'True').lower() == 'true'
+    OPENAI_WARMUP = os.getenv('OPENAI_WARMUP', 'True').lower() == 'true'
+    OPENAI_RPM_LIMIT = int(os.getenv('OPENAI_RPM_LIMIT', 3000))
+    OPENAI_TPM_LIMIT = int(os.getenv('OPENAI_TPM_LIMIT', 80000))
+    MAX_MESSAGE_AGE = int(os.getenv('MAX_MESSAGE_AGE', 600))
+    SEEN_MESSAGE_TTL = int(os.getenv('SEEN_MESSAGE_TTL', 600))
+    WEB_CONCURRENCY = max(1, int(os.getenv('WEB_CONCURRENCY', 1)))
+    OPENAI_DEADLINE = float(os.getenv('OPENAI_DEADLINE', 30))
+
+GRAPH_API_BASE = "https://graph.facebook.com/v18.0"
+GRAPH_API_URL = f"{GRAPH_API_BASE}/{Config.WHATSAPP_PHONE_NUMBER_ID}/messages"
+
+# Shared HTTP session so outbound sends reuse keep-alive connections to the Graph API
+SESSION = requests.Session()
+SESSION.headers.update({
+    'Authorization': f'Bearer {Config.WHATSAPP_TOKEN}',
+    'Content-Type': 'application/json'
+})
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    # Only retry failures where Meta cannot have accepted the message, to avoid double sends
+    max_retries=Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=[429, 503],
+        allowed_methods=None,
+        raise_on_status=False
+    )
+))
+
+# Shared OpenAI client with bounded latency; reusing it keeps a warm pool to api.openai.com
+AI_CLIENT = OpenAI(
+    api_key=Config.OPENAI_API_KEY,
+    timeout=httpx.Timeout(15.0, connect=3.0),
+    max_retries=2
+) if Config.OPENAI_API_KEY else None
+
+# Replies (template lookup, OpenAI, Graph API) run here so the webhook can ACK immediately
+EXECUTOR = ThreadPoolExecutor(max_workers=Config.WORKER_THREADS, thread_name_prefix='reply')
+# Typing indicators get their own pool so they never queue behind reply jobs
+TYPING_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='typing')
+
+# Successful AI replies keyed by normalized message text; the TTL lets stale answers age out
+AI_RESPONSE_CACHE = TTLCache(maxsize=4096, ttl=Config.AI_CACHE_TTL)
+# OpenAI calls currently running, so a burst of identical messages shares one completion
+AI_IN_FLIGHT: Dict[str, Future] = {}
+AI_CACHE_LOCK = threading.Lock()
+
+# Message IDs already handled; Meta redelivers webhooks that were not ACKed quickly.
+# IDs are kept at least as long as the age window so no retry slips between the two checks.
+if Config.SEEN_MESSAGE_TTL <= 0:
+    raise ValueError('SEEN_MESSAGE_TTL must be a positive number of seconds')
+SEEN_MESSAGES = TTLCache(maxsize=10000, ttl=max(Config.SEEN_MESSAGE_TTL, Config.MAX_MESSAGE_AGE))
+SEEN_LOCK = threading.Lock()
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for faster (de)serialization"""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+WORD_RE = re.compile(r'\w+')
+
+class TokenBucket:
+    """Thread-safe token bucket that blocks until enough capacity has refilled"""
+    
+    def __init__(self, capacity: int, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, amount: int = 1):
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+# Pace OpenAI calls under the account limits instead of hitting 429s and SDK backoff.
+# The limits are account-wide, so each worker process gets an equal share.
+OPENAI_RPM = TokenBucket(max(1, Config.OPENAI_RPM_LIMIT // Config.WEB_CONCURRENCY))
+OPENAI_TPM = TokenBucket(max(1, Config.OPENAI_TPM_LIMIT // Config.WEB_CONCURRENCY))
 
 @dataclass
 class MessageTemplate:
     category: str
     keywords: List[str]
     template: str
+    keyword_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    phrase_pattern: Optional[re.Pattern] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Single words are matched against the message's token set; multi-word
+        # phrases use a whole-word, case-insensitive regex
+        keywords = [keyword.lower() for keyword in self.keywords]
+        self.keyword_set = frozenset(k for k in keywords if WORD_RE.fullmatch(k))
+        phrases = [k for k in keywords if k not in self.keyword_set]
+        if phrases:
+            alternation = '|'.join(map(re.escape, phrases))
+            self.phrase_pattern = re.compile(rf'\b(?:{alternation})\b', re.IGNORECASE)
+        else:
+            self.phrase_pattern = None
     
 # Knowledge Base - Loaded from the files we found
 KNOWLEDGE_BASE = {
@@ -75,6 +199,25 @@ KNOWLEDGE_BASE = {
     }
 }
 
+# Static system prompt, built once so every request shares an identical (cacheable) prefix
+SYSTEM_PROMPT = f"""You are an AI assistant for Resilient Equity Green Tech Foundation, a Zambian youth-led non-profit organization.
+            
+            Organization Info:
+            {KNOWLEDGE_BASE['mission']}
+            
+            Contact: {KNOWLEDGE_BASE['contact']['email']} | {KNOWLEDGE_BASE['contact']['website']}
+            
+            Respond helpfully and professionally to inquiries. Keep responses concise but informative. Always include contact information when appropriate.
+            Use emojis sparingly but appropriately. Focus on our mission of technology for social good, environmental sustainability, and youth empowerment."""
+BASE_MESSAGES = ({"role": "system", "content": SYSTEM_PROMPT},)
+AI_MAX_TOKENS = 500
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for rate limiting"""
+    return len(text) // 4 + 1
+
+SYSTEM_PROMPT_TOKENS = estimate_tokens(SYSTEM_PROMPT)
+
 # Message Templates based on the email templates we found
 MESSAGE_TEMPLATES = [
     MessageTemplate(
@@ -173,16 +316,124 @@ Contact: info@regtech.agency | https://resgreentech.tech/"""
     )
 ]
 
+def normalize_message(message_text: str) -> str:
+    """Lowercase and collapse whitespace so equivalent messages share a cache key"""
+    return ' '.join(message_text.lower().split())
+
+def match_phrase(message_text: str) -> Optional[int]:
+    """Return the lowest template index with a multi-word phrase in the message"""
+    for index, template in enumerate(MESSAGE_TEMPLATES):
+        if template.phrase_pattern and template.phrase_pattern.search(message_text):
+            return index
+    return None
+
+@lru_cache(maxsize=4096)
+def match_template(message_text: str) -> Optional[MessageTemplate]:
+    """Return the highest-priority template with a keyword in the message"""
+    # Single-word keywords: one set probe per template against the message's tokens
+    tokens = frozenset(WORD_RE.findall(message_text.lower()))
+    word_index = next(
+        (index for index, template in enumerate(MESSAGE_TEMPLATES) if not template.keyword_set.isdisjoint(tokens)),
+        None
+    )
+    indexes = [index for index in (word_index, match_phrase(message_text)) if index is not None]
+    # The lowest index wins to keep template order
+    return MESSAGE_TEMPLATES[min(indexes)] if indexes else None
+
+# The dashboard only shows static configuration, so it is rendered once at startup
+STARTED_AT = datetime.now()
+DASHBOARD_HTML = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Resilient Equity WhatsApp AI Agent</title>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <style>
+            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 20px; background: #f5f5f5; }}
+            .container {{ max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
+            .header {{ text-align: center; margin-bottom: 30px; }}
+            .logo {{ font-size: 2em; color: #2d5a27; margin-bottom: 10px; }}
+            .status {{ display: inline-block; padding: 5px 15px; background: #4CAF50; color: white; border-radius: 20px; font-size: 0.9em; }}
+            .info-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; margin: 30px 0; }}
+            .info-card {{ background: #f8f9fa; padding: 20px; border-radius: 8px; border-left: 4px solid #2d5a27; }}
+            .info-card h3 {{ margin: 0 0 10px 0; color: #2d5a27; }}
+            .footer {{ text-align: center; margin-top: 30px; color: #666; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <div class="logo">🌱 Resilient Equity WhatsApp AI Agent</div>
+                <div class="status">● Active</div>
+            </div>
+            
+            <div class="info-grid">
+                <div class="info-card">
+                    <h3>📱 WhatsApp Integration</h3>
+                    <p>Automated responses for WhatsApp Business API</p>
+                    <p><strong>Phone ID:</strong> {Config.WHATSAPP_PHONE_NUMBER_ID}</p>
+                </div>
+                
+                <div class="info-card">
+                    <h3>🤖 AI Features</h3>
+                    <p>Intelligent message categorization and responses</p>
+                    <p><strong>Templates:</strong> {len(MESSAGE_TEMPLATES)} categories</p>
+                </div>
+                
+                <div class="info-card">
+                    <h3>📊 Knowledge Base</h3>
+                    <p>Comprehensive information about our foundation</p>
+                    <p><strong>Projects:</strong> {len(KNOWLEDGE_BASE['projects'])} active</p>
+                </div>
+                
+                <div class="info-card">
+                    <h3>🔗 Contact</h3>
+                    <p>Email: {KNOWLEDGE_BASE['contact']['email']}</p>
+                    <p>Website: {KNOWLEDGE_BASE['contact']['website']}</p>
+                </div>
+            </div>
+            
+            <div class="footer">
+                <p>Resilient Equity Green Tech Foundation - Empowering communities through technology, sustainability, and innovation.</p>
+                <p>Last updated: {STARTED_AT.strftime('%Y-%m-%d %H:%M:%S')}</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+DASHBOARD_ETAG = hashlib.md5(DASHBOARD_HTML.encode()).hexdigest()
+
+HEALTH_BODY = b'{"status":"healthy"}'
+
 class WhatsAppAIAgent:
     def __init__(self):
         self.app = Flask(__name__)
-        if Config.OPENAI_API_KEY:
-            openai.api_key = Config.OPENAI_API_KEY
-            self.openai_client = openai
-        else:
-            self.openai_client = None
+        self.app.json = OrjsonProvider(self.app)
+        Compress(self.app)
+        self.openai_client = AI_CLIENT
+        if not Config.APP_SECRET:
+            logger.warning('META_APP_SECRET not set; webhook signatures will not be verified')
+        if Config.WEB_CONCURRENCY > 1:
+            logger.warning('WEB_CONCURRENCY > 1: duplicate detection is per worker, so redelivered webhooks may be answered twice')
+        if Config.WHATSAPP_WARMUP or Config.OPENAI_WARMUP:
+            threading.Thread(target=self.warm_up_connections, name='warmup', daemon=True).start()
         self.setup_routes()
         
+    def warm_up_connections(self):
+        """Open the Graph API and OpenAI connections before the first message arrives"""
+        if Config.WHATSAPP_WARMUP:
+            try:
+                SESSION.head(GRAPH_API_BASE, timeout=(3, 10))
+            except Exception as e:
+                logger.warning(f'WhatsApp connection warm-up failed: {str(e)}')
+        
+        if Config.OPENAI_WARMUP and self.openai_client:
+            try:
+                self.openai_client.models.list()
+            except Exception as e:
+                logger.warning(f'OpenAI connection warm-up failed: {str(e)}')
+    
     def setup_routes(self):
         @self.app.route('/webhook', methods=['GET', 'POST'])
         def webhook():
@@ -193,7 +444,10 @@ class WhatsAppAIAgent:
                 
         @self.app.route('/health', methods=['GET'])
         def health_check():
-            return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+            # Probes hit this every few seconds, so skip JSON encoding unless a timestamp is asked for
+            if request.args.get('ts', '').lower() in ('1', 'true'):
+                return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+            return Response(HEALTH_BODY, mimetype='application/json')
             
         @self.app.route('/', methods=['GET'])
         def home():
@@ -201,31 +455,49 @@ class WhatsAppAIAgent:
     
     def verify_webhook(self):
         """Verify webhook for WhatsApp Business API"""
-        mode = request.args.get('hub.mode')
-        token = request.args.get('hub.verify_token')
-        challenge = request.args.get('hub.challenge')
+        args = request.args
+        mode = args.get('hub.mode')
+        token = args.get('hub.verify_token') or ''
+        challenge = args.get('hub.challenge')
         
-        if mode == 'subscribe' and token == Config.VERIFY_TOKEN:
+        # Constant-time comparison so the token can't be guessed from response timing
+        if mode == 'subscribe' and hmac.compare_digest(token.encode(), Config.VERIFY_TOKEN.encode()):
             logger.info('Webhook verified successfully')
             return challenge
         else:
             logger.warning('Webhook verification failed')
             return 'Verification failed', 403
     
+    def verify_signature(self, payload: bytes) -> bool:
+        """Check Meta's X-Hub-Signature-256 HMAC over the raw request body"""
+        if not Config.APP_SECRET:
+            return True
+        
+        signature = request.headers.get('X-Hub-Signature-256', '')
+        expected = 'sha256=' + hmac.new(Config.APP_SECRET.encode(), payload, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(signature.encode(), expected.encode())
+    
     def handle_message(self):
         """Handle incoming WhatsApp messages"""
         try:
-            data = request.get_json()
-            logger.info(f'Received webhook data: {json.dumps(data, indent=2)}')
+            payload = request.get_data()
+            # Reject forged requests before spending any time parsing them
+            if not self.verify_signature(payload):
+                logger.warning('Webhook signature verification failed')
+                return jsonify({'status': 'error', 'message': 'Invalid signature'}), 403
+            
+            data = orjson.loads(payload)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Received webhook data: %s', orjson.dumps(data).decode())
             
             if 'entry' in data:
                 for entry in data['entry']:
                     if 'changes' in entry:
                         for change in entry['changes']:
                             if change.get('field') == 'messages':
-                                self.process_message(change['value'])
+                                EXECUTOR.submit(self.process_message, change['value'])
             
-            return jsonify({'status': 'success'}), 200
+            return jsonify({'status': 'queued'}), 200
             
         except Exception as e:
             logger.error(f'Error handling message: {str(e)}')
@@ -236,14 +508,37 @@ class WhatsAppAIAgent:
         try:
             if 'messages' in message_data:
                 for message in message_data['messages']:
+                    with SEEN_LOCK:
+                        if message['id'] in SEEN_MESSAGES:
+                            logger.info(f"Skipping duplicate message {message['id']}")
+                            continue
+                        SEEN_MESSAGES[message['id']] = True
+                    
+                    # Media, reactions, etc. have no text to answer
+                    if message.get('type') != 'text':
+                        continue
+                    message_text = message['text']['body']
+                    if not message_text.strip():
+                        continue
+                    
+                    # Don't answer late webhook retries of messages that are long gone
+                    # (a MAX_MESSAGE_AGE of 0 or less disables the check)
+                    try:
+                        timestamp = int(message.get('timestamp') or 0)
+                    except (TypeError, ValueError):
+                        # A malformed timestamp must not abort the rest of the batch
+                        timestamp = 0
+                    if Config.MAX_MESSAGE_AGE > 0 and timestamp and time.time() - timestamp > Config.MAX_MESSAGE_AGE:
+                        logger.info(f"Skipping stale message {message['id']}")
+                        continue
+                    
                     sender = message['from']
-                    message_text = message.get('text', {}).get('body', '')
                     message_id = message['id']
                     
                     logger.info(f'Processing message from {sender}: {message_text}')
                     
                     # Generate response
-                    response = self.generate_response(message_text, sender)
+                    response = self.generate_response(message_text, sender, message_id)
                     
                     # Send response
                     if response:
@@ -252,62 +547,105 @@ class WhatsAppAIAgent:
         except Exception as e:
             logger.error(f'Error processing message: {str(e)}')
     
-    def generate_response(self, message_text: str, sender: str) -> str:
+    def generate_response(self, message_text: str, sender: str, message_id: Optional[str] = None) -> str:
         """Generate appropriate response based on message content"""
-        message_lower = message_text.lower()
-        
         # Find matching template
-        for template in MESSAGE_TEMPLATES:
-            if any(keyword in message_lower for keyword in template.keywords):
-                logger.info(f'Matched template category: {template.category}')
-                return template.template
+        template = match_template(normalize_message(message_text))
+        if template:
+            logger.info(f'Matched template category: {template.category}')
+            return template.template
         
         # If no template matches, use AI if available
         if self.openai_client:
-            return self.generate_ai_response(message_text)
+            return self.generate_ai_response(message_text, message_id)
         
         # Fallback to general template
         return MESSAGE_TEMPLATES[-1].template  # General template
     
-    def generate_ai_response(self, message_text: str) -> str:
+    def generate_ai_response(self, message_text: str, message_id: Optional[str] = None) -> str:
         """Generate AI response using OpenAI"""
+        cache_key = normalize_message(message_text)
+        with AI_CACHE_LOCK:
+            cached = AI_RESPONSE_CACHE.get(cache_key)
+            pending = AI_IN_FLIGHT.get(cache_key)
+            if not cached and pending is None:
+                AI_IN_FLIGHT[cache_key] = Future()
+        if cached:
+            logger.info('Serving cached AI response')
+            return cached
+        
+        # A completion takes seconds, so show the user we're typing in the meantime. The
+        # indicator is fire-and-forget so its Graph API round trip never delays the reply.
+        if pending is not None:
+            if message_id:
+                TYPING_EXECUTOR.submit(self.send_typing_indicator, message_id)
+            logger.info('Joining in-flight AI request for identical message')
+            return pending.result()
+        
+        reply = MESSAGE_TEMPLATES[-1].template  # Fallback to general template
         try:
-            system_prompt = f"""You are an AI assistant for Resilient Equity Green Tech Foundation, a Zambian youth-led non-profit organization.
-            
-            Organization Info:
-            {KNOWLEDGE_BASE['mission']}
+            if message_id:
+                TYPING_EXECUTOR.submit(self.send_typing_indicator, message_id)
             
-            Contact: {KNOWLEDGE_BASE['contact']['email']} | {KNOWLEDGE_BASE['contact']['website']}
+            # OpenAI counts prompt tokens plus max_tokens against the TPM limit
+            OPENAI_RPM.acquire()
+            OPENAI_TPM.acquire(SYSTEM_PROMPT_TOKENS + estimate_tokens(message_text) + AI_MAX_TOKENS)
             
-            Respond helpfully and professionally to inquiries. Keep responses concise but informative. Always include contact information when appropriate.
-            Use emojis sparingly but appropriately. Focus on our mission of technology for social good, environmental sustainability, and youth empowerment."""
-            
-            response = self.openai_client.ChatCompletion.create(
+            # The client timeout only bounds each chunk of a stream, so enforce a total deadline
+            deadline = time.monotonic() + Config.OPENAI_DEADLINE
+            stream = self.openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": message_text}
-                ],
-                max_tokens=500,
-                temperature=0.7
+                messages=[*BASE_MESSAGES, {"role": "user", "content": message_text}],
+                max_tokens=AI_MAX_TOKENS,
+                temperature=0.7,
+                stream=True
             )
             
-            return response.choices[0].message.content
+            # Collect the streamed deltas and join once at the end
+            chunks = []
+            for chunk in stream:
+                if time.monotonic() > deadline:
+                    stream.close()
+                    raise TimeoutError(f'completion exceeded {Config.OPENAI_DEADLINE:g}s deadline')
+                if chunk.choices:
+                    chunks.append(chunk.choices[0].delta.content or '')
+            text = ''.join(chunks)
+            # Only successful completions are cached; the error fallback is not
+            if text:
+                reply = text
+                with AI_CACHE_LOCK:
+                    AI_RESPONSE_CACHE[cache_key] = reply
             
         except Exception as e:
             logger.error(f'Error generating AI response: {str(e)}')
-            return MESSAGE_TEMPLATES[-1].template  # Fallback to general template
+        
+        finally:
+            with AI_CACHE_LOCK:
+                AI_IN_FLIGHT.pop(cache_key).set_result(reply)
+        
+        return reply
     
-    def send_message(self, recipient: str, message: str):
-        """Send message via WhatsApp Business API"""
+    def send_typing_indicator(self, message_id: str):
+        """Mark a message as read and show the typing indicator to its sender"""
         try:
-            url = f"https://graph.facebook.com/v18.0/{Config.WHATSAPP_PHONE_NUMBER_ID}/messages"
-            
-            headers = {
-                'Authorization': f'Bearer {Config.WHATSAPP_TOKEN}',
-                'Content-Type': 'application/json'
+            data = {
+                'messaging_product': 'whatsapp',
+                'status': 'read',
+                'message_id': message_id,
+                'typing_indicator': {'type': 'text'}
             }
             
+            response = SESSION.post(GRAPH_API_URL, json=data, timeout=(3, 10))
+            
+            if response.status_code != 200:
+                logger.warning(f'Failed to send typing indicator: {response.status_code} - {response.text}')
+                
+        except Exception as e:
+            logger.warning(f'Error sending typing indicator: {str(e)}')
+    
+    def send_message(self, recipient: str, message: str):
+        """Send message via WhatsApp Business API"""
+        try:
             data = {
                 'messaging_product': 'whatsapp',
                 'to': recipient,
@@ -315,7 +653,7 @@ class WhatsAppAIAgent:
                 'text': {'body': message}
             }
             
-            response = requests.post(url, headers=headers, json=data)
+            response = SESSION.post(GRAPH_API_URL, json=data, timeout=(3, 10))
             
             if response.status_code == 200:
                 logger.info(f'Message sent successfully to {recipient}')
@@ -327,66 +665,18 @@ class WhatsAppAIAgent:
     
     def render_dashboard(self):
         """Render simple web dashboard"""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Resilient Equity WhatsApp AI Agent</title>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1">
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 20px; background: #f5f5f5; }}
-                .container {{ max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                .header {{ text-align: center; margin-bottom: 30px; }}
-                .logo {{ font-size: 2em; color: #2d5a27; margin-bottom: 10px; }}
-                .status {{ display: inline-block; padding: 5px 15px; background: #4CAF50; color: white; border-radius: 20px; font-size: 0.9em; }}
-                .info-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; margin: 30px 0; }}
-                .info-card {{ background: #f8f9fa; padding: 20px; border-radius: 8px; border-left: 4px solid #2d5a27; }}
-                .info-card h3 {{ margin: 0 0 10px 0; color: #2d5a27; }}
-                .footer {{ text-align: center; margin-top: 30px; color: #666; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <div class="logo">🌱 Resilient Equity WhatsApp AI Agent</div>
-                    <div class="status">● Active</div>
-                </div>
-                
-                <div class="info-grid">
-                    <div class="info-card">
-                        <h3>📱 WhatsApp Integration</h3>
-                        <p>Automated responses for WhatsApp Business API</p>
-                        <p><strong>Phone ID:</strong> {Config.WHATSAPP_PHONE_NUMBER_ID}</p>
-                    </div>
-                    
-                    <div class="info-card">
-                        <h3>🤖 AI Features</h3>
-                        <p>Intelligent message categorization and responses</p>
-                        <p><strong>Templates:</strong> {len(MESSAGE_TEMPLATES)} categories</p>
-                    </div>
-                    
-                    <div class="info-card">
-                        <h3>📊 Knowledge Base</h3>
-                        <p>Comprehensive information about our foundation</p>
-                        <p><strong>Projects:</strong> {len(KNOWLEDGE_BASE['projects'])} active</p>
-                    </div>
-                    
-                    <div class="info-card">
-                        <h3>🔗 Contact</h3>
-                        <p>Email: {KNOWLEDGE_BASE['contact']['email']}</p>
-                        <p>Website: {KNOWLEDGE_BASE['contact']['website']}</p>
-                    </div>
-                </div>
-                
-                <div class="footer">
-                    <p>Resilient Equity Green Tech Foundation - Empowering communities through technology, sustainability, and innovation.</p>
-                    <p>Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        # Flask-Compress tags compressed variants as "<etag>:<algorithm>", so compare the base tag.
+        # If-None-Match uses weak comparison, so tags weakened by a proxy (W/"...") count too.
+        if_none_match = request.if_none_match
+        cached_etags = {etag.split(':')[0] for etag in if_none_match.as_set(include_weak=True)}
+        if if_none_match.star_tag or DASHBOARD_ETAG in cached_etags:
+            response = Response(status=304)
+        else:
+            response = Response(DASHBOARD_HTML, mimetype='text/html')
+        
+        response.headers['Cache-Control'] = 'public, max-age=300'
+        response.set_etag(DASHBOARD_ETAG)
+        return response
     
     def run(self):
         """Start the application"""
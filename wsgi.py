@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for production servers
+Run with: gunicorn -k gevent -w 1 --worker-connections 1000 -b 0.0.0.0:$PORT wsgi:app
+Keep a single worker: duplicate detection, caches and rate limits live in process memory
+"""
+
+from app import WhatsAppAIAgent
+
+app = WhatsAppAIAgent().app